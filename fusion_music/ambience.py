@@ -5,6 +5,8 @@ import math
 import numpy as np
 from scipy import signal
 
+from .dsp import butter_sos
+
 
 class AmbienceRenderer:
     def __init__(self, sample_rate: int = 44_100, seed: int = 0) -> None:
@@ -141,12 +143,7 @@ class AmbienceRenderer:
     def _filter(self, mono: np.ndarray, btype: str, cutoff: float | tuple[float, float]) -> np.ndarray:
         if len(mono) < 64:
             return mono
-        if isinstance(cutoff, tuple):
-            normalized = [value / (self.sample_rate / 2) for value in cutoff]
-        else:
-            normalized = cutoff / (self.sample_rate / 2)
-        sos = signal.butter(3, normalized, btype=btype, output="sos")
-        return signal.sosfiltfilt(sos, mono)
+        return signal.sosfiltfilt(butter_sos(btype, cutoff, self.sample_rate), mono)
 
     def _pan(self, mono: np.ndarray, pan: float) -> np.ndarray:
         left_gain = math.sqrt((1.0 - pan) / 2.0)
@@ -1,36 +1,80 @@
 from __future__ import annotations
 
 import random
-from typing import Any
+from typing import Any, Sequence
 
+import numpy as np
 import pretty_midi
 
 from .defaults import BASS_PATTERNS, DRUM_PATTERNS, LEAD_PATTERNS, PIANO_PATTERNS
 from .harmony import HarmonyEngine
 from .models import SectionPlan, TrackPlan
-from .theory import chord_root, chord_tones, nearest_scale_note, scale_notes_for_range, voice_led_chord
+from .notes import NoteBuffer
+from .theory import (
+    chord_root,
+    chord_tones,
+    extend_chord_symbol,
+    nearest_scale_index,
+    nearest_scale_note,
+    scale_notes_for_range,
+    voice_led_chord,
+)
+
+DRUM_LANES = ("kick", "snare", "hat", "ghost", "open")
+KICK, SNARE, HAT, GHOST, OPEN = range(len(DRUM_LANES))
+DRUM_LANE_PITCHES = np.array([36, 38, 42, 37, 46])
+DRUM_LANE_DURATIONS = np.array([0.18, 0.16, 0.08, 0.05, 0.15])
+DRUM_LANE_SWINGABLE = np.array([False, False, True, True, True])
+STEP_INDEX = np.arange(16)
+SWUNG_STEPS = STEP_INDEX % 4 >= 2
+STEP_MASK = 0xFFFF
+ODD_STEP_MASK = 0xAAAA
+DOWNBEAT_STEPS = STEP_INDEX % 4 == 0
+KICK_BREAKDOWN_STEPS = np.isin(STEP_INDEX, (0, 8))
+DRUM_FILL_STEPS = ~np.isin(STEP_INDEX, (4, 12))
+# Bars sample hat flips and kick/ghost fills from a per-plan pool of this size, so a fill can recur within a track.
+DRUM_VARIATION_COUNT = 32
+DRUM_PATTERN_BANK = {
+    style: [np.array([pattern[lane] for lane in DRUM_LANES], dtype=np.uint8) for pattern in patterns]
+    for style, patterns in DRUM_PATTERNS.items()
+}
+KEYS_PATTERN_BANK = {
+    style: [np.array(pattern, dtype=np.uint8) for pattern in patterns] for style, patterns in PIANO_PATTERNS.items()
+}
 
 
 class FusionComposer:
     def __init__(self, plan: TrackPlan) -> None:
         self.plan = plan
         self.rng = random.Random(plan.seed)
+        self.humanize_rng = np.random.default_rng(plan.seed + 29)
+        self.drum_flips, self.drum_fills = self._build_drum_variations()
         self.bar_duration = 240.0 / plan.bpm
         self.sixteenth_duration = self.bar_duration / 16.0
+        self.step_offsets = tuple(step * self.sixteenth_duration for step in range(16))
+        self.step_grid = np.array(self.step_offsets)
+        self.swing_grid = np.where(SWUNG_STEPS, plan.swing * self.sixteenth_duration, 0.0)
+        self.step_swing = tuple(self.swing_grid.tolist())
+        self.jitter_scale = plan.humanization * self.sixteenth_duration
         self.scale_pool = scale_notes_for_range(plan.key, plan.mode, 36, 96)
         self.upper_scale_pool = [pitch for pitch in self.scale_pool if 67 <= pitch <= 96]
         self.mid_scale_pool = [pitch for pitch in self.scale_pool if 55 <= pitch <= 88]
         self.lower_scale_pool = [pitch for pitch in self.scale_pool if 28 <= pitch <= 60]
+        self.lead_pitches = tuple(self._lead_pitch(pitch) for pitch in self.upper_scale_pool)
+        self.counter_pitches = tuple(self._counter_pitch(pitch) for pitch in self.mid_scale_pool)
         self.harmony = HarmonyEngine(plan)
+        self.anchor_cache: dict[tuple[str, str], int] = {}
         self.base_motif = self._generate_base_motif()
+        self.counter_motif = [-degree for degree in self.base_motif[:5]]
         self.base_riff_steps = self._generate_riff_steps(plan.riff_density)
         self.base_counter_steps = self._generate_counter_steps()
         self.instruments = self._build_instruments()
+        self.notes = {role: NoteBuffer() for role in self.instruments}
 
     def compose(self) -> tuple[pretty_midi.PrettyMIDI, dict[str, Any]]:
         midi = pretty_midi.PrettyMIDI(initial_tempo=self.plan.bpm)
         section_summaries: list[dict[str, Any]] = []
-        current_time = 0.0
+        bars_elapsed = 0
         previous_voicing: list[int] | None = None
         previous_degree: str | None = None
 
@@ -41,14 +85,19 @@ class FusionComposer:
                 next_section_name=next_section_name,
                 previous_degree=previous_degree,
             )
-            section_start = current_time
-            section_end = section_start + section.bars * self.bar_duration
+            bar_starts = ((bars_elapsed + np.arange(section.bars + 1)) * self.bar_duration).tolist()
+            active_roles = {role for role in section.layers if self._role_active(section, role)}
+            keys_patterns = self.rng.choices(KEYS_PATTERN_BANK[self.plan.piano_style], k=section.bars)
+            drum_patterns = self.rng.choices(DRUM_PATTERN_BANK[self.plan.drum_style], k=section.bars)
+            drum_variations = self.humanize_rng.integers(DRUM_VARIATION_COUNT, size=section.bars).tolist()
+            section_start = bar_starts[0]
+            section_end = bar_starts[-1]
 
             for bar_index in range(section.bars):
                 raw_chord = progression[bar_index]
                 chord_symbol = self._embellish_chord_symbol(raw_chord, section, section_index, bar_index)
                 next_symbol = progression[(bar_index + 1) % len(progression)]
-                bar_start = section_start + bar_index * self.bar_duration
+                bar_start = bar_starts[bar_index]
                 voicing = voice_led_chord(
                     chord_symbol,
                     self.plan.key,
@@ -57,24 +106,24 @@ class FusionComposer:
                     rootless=True,
                 )
 
-                if self._role_active(section, "keys"):
-                    self._write_keys(section, voicing, bar_start, bar_index)
-                if self._role_active(section, "bass"):
+                if "keys" in active_roles:
+                    self._write_keys(section, keys_patterns[bar_index], voicing, bar_start, bar_index)
+                if "bass" in active_roles:
                     self._write_bass(section, chord_symbol, next_symbol, bar_start, bar_index)
-                if self._role_active(section, "lead"):
+                if "lead" in active_roles:
                     self._write_lead(section, chord_symbol, bar_start, bar_index)
-                if self._role_active(section, "counter"):
+                if "counter" in active_roles:
                     self._write_counter(section, chord_symbol, bar_start, bar_index)
-                if self._role_active(section, "pad"):
+                if "pad" in active_roles:
                     self._write_pad(section, voicing, bar_start, section_end, bar_index)
-                if self._role_active(section, "drums"):
-                    self._write_drums(section, bar_start, bar_index)
-                if self._role_active(section, "percussion"):
+                if "drums" in active_roles:
+                    self._write_drums(section, drum_patterns[bar_index], drum_variations[bar_index], bar_start, bar_index)
+                if "percussion" in active_roles:
                     self._write_percussion(section, bar_start, bar_index)
 
                 previous_voicing = voicing
 
-            if self._role_active(section, "drums") and section_index < len(self.plan.sections) - 1:
+            if "drums" in active_roles and section_index < len(self.plan.sections) - 1:
                 if section.variation in {"lift", "release"}:
                     self._write_fill(section_end - self.bar_duration * 0.5)
 
@@ -89,16 +138,16 @@ class FusionComposer:
                     "variation": section.variation,
                 }
             )
-            current_time = section_end
+            bars_elapsed += section.bars
 
-        for instrument in self.instruments.values():
-            if instrument.notes:
-                instrument.notes.sort(key=lambda note: note.start)
+        for role, instrument in self.instruments.items():
+            if self.notes[role]:
+                instrument.notes = self.notes[role].to_notes()
                 midi.instruments.append(instrument)
 
         return midi, {
-            "duration_seconds": round(current_time, 3),
-            "total_bars": sum(section.bars for section in self.plan.sections),
+            "duration_seconds": round(bars_elapsed * self.bar_duration, 3),
+            "total_bars": bars_elapsed,
             "sections": section_summaries,
             "instrument_palette": {
                 "keys_sound": self.plan.keys_sound,
@@ -190,10 +239,10 @@ class FusionComposer:
         candidates = [0, 2, 4, 6, 8, 10, 12, 14]
         if density > 0.55:
             candidates.extend([1, 5, 7, 11, 15])
-        chosen = {0}
-        while len(chosen) < count:
-            chosen.add(self.rng.choice(candidates))
-        return sorted(chosen)
+        chosen = 1
+        while bin(chosen).count("1") < count:
+            chosen |= 1 << self.rng.choice(candidates)
+        return _mask_steps(chosen)
 
     def _generate_counter_steps(self) -> list[int]:
         steps = [step + 1 for step in self.base_riff_steps if step + 1 < 16 and step % 4 == 0]
@@ -210,16 +259,26 @@ class FusionComposer:
             return False
         return True
 
-    def _write_keys(self, section: SectionPlan, voicing: list[int], bar_start: float, bar_index: int) -> None:
-        patterns = PIANO_PATTERNS[self.plan.piano_style]
-        base_pattern = list(patterns[self.rng.randrange(len(patterns))])
+    def _write_keys(
+        self,
+        section: SectionPlan,
+        base_pattern: np.ndarray,
+        voicing: list[int],
+        bar_start: float,
+        bar_index: int,
+    ) -> None:
         pattern = self._mutate_step_pattern(base_pattern, section, bar_index, role="keys")
         velocity = int(42 + section.intensity * 32)
+        duration_steps = 3 if self.plan.keys_sound == "jazz_guitar" else 6 if self.plan.piano_style == "lush_spread" else 4
+        spread = 0.012 if self.plan.keys_sound in {"jazz_guitar", "upright_piano"} else 0.007
+        jitters = self.humanize_rng.uniform(-1.0, 1.0, size=len(pattern)).tolist()
+        velocities = (velocity + self.humanize_rng.integers(-10, 11, size=(len(pattern), len(voicing)))).tolist()
+        bar_end = bar_start + self.bar_duration
+        notes = self.notes["keys"]
 
         for hit_index, step in enumerate(pattern):
-            start = self._step_time(bar_start, step, swingable=True)
-            duration_steps = 3 if self.plan.keys_sound == "jazz_guitar" else 6 if self.plan.piano_style == "lush_spread" else 4
-            end = min(bar_start + self.bar_duration, start + duration_steps * self.sixteenth_duration)
+            start = self._step_time(bar_start, step, swingable=True, jitter=jitters[hit_index])
+            end = min(bar_end, start + duration_steps * self.sixteenth_duration)
             chord_slice = voicing
 
             if self.plan.piano_style == "broken_voicings":
@@ -228,15 +287,9 @@ class FusionComposer:
             elif self.plan.keys_sound == "jazz_guitar":
                 chord_slice = voicing[: min(3, len(voicing))]
 
+            hit_velocities = velocities[hit_index]
             for note_offset, pitch in enumerate(chord_slice):
-                offset = note_offset * (0.012 if self.plan.keys_sound in {"jazz_guitar", "upright_piano"} else 0.007)
-                self._add_note(
-                    self.instruments["keys"],
-                    pitch,
-                    start + offset,
-                    end,
-                    velocity + self.rng.randint(-10, 10),
-                )
+                notes.append(pitch, start + note_offset * spread, end, hit_velocities[note_offset])
 
     def _write_bass(
         self,
@@ -246,52 +299,37 @@ class FusionComposer:
         bar_start: float,
         bar_index: int,
     ) -> None:
-        base_pattern = list(BASS_PATTERNS[self.plan.bass_style][bar_index % len(BASS_PATTERNS[self.plan.bass_style])])
-        pattern = self._mutate_step_pattern(base_pattern, section, bar_index, role="bass")
+        bass_patterns = BASS_PATTERNS[self.plan.bass_style]
+        pattern = self._mutate_step_pattern(bass_patterns[bar_index % len(bass_patterns)], section, bar_index, role="bass")
         root = chord_root(chord_symbol, self.plan.key, self.plan.mode, octave=2)
         next_root = chord_root(next_symbol, self.plan.key, self.plan.mode, octave=2)
         chord_pool = chord_tones(chord_symbol, self.plan.key, self.plan.mode, octave=2, rootless=False)
         velocity = int(58 + section.intensity * 28)
+        jitters = self.humanize_rng.uniform(-1.0, 1.0, size=len(pattern)).tolist()
+        velocities = (velocity + self.humanize_rng.integers(-8, 9, size=len(pattern))).tolist()
 
-        for note_index, step in enumerate(pattern):
-            start = self._step_time(bar_start, step, swingable=False)
-            next_step = pattern[note_index + 1] if note_index + 1 < len(pattern) else 16
-            end = bar_start + min(16, next_step) * self.sixteenth_duration * 0.96
-            pitch = self._choose_bass_pitch(root, next_root, chord_pool, note_index, section)
-            self._add_note(
-                self.instruments["bass"],
-                pitch,
-                start,
-                end,
-                velocity + self.rng.randint(-8, 8),
-            )
+        starts = [self._step_time(bar_start, step, swingable=False, jitter=jitter) for step, jitter in zip(pattern, jitters)]
+        ends = [bar_start + min(16, next_step) * self.sixteenth_duration * 0.96 for next_step in pattern[1:] + [16]]
+        cycle = self._bass_pitch_cycle(root, next_root, chord_pool)
+        pitches = [self._choose_bass_pitch(cycle, note_index, section) for note_index in range(len(pattern))]
+        self.notes["bass"].append_batch(pitches, starts, ends, velocities)
 
-    def _choose_bass_pitch(
-        self,
-        root: int,
-        next_root: int,
-        chord_pool: list[int],
-        note_index: int,
-        section: SectionPlan,
-    ) -> int:
+    def _bass_pitch_cycle(self, root: int, next_root: int, chord_pool: list[int]) -> list[int]:
         if self.plan.bass_style == "root_pocket":
-            choices = [root, root + 12, chord_pool[min(2, len(chord_pool) - 1)] - 12, root + 14]
-            pitch = choices[note_index % len(choices)]
-        elif self.plan.bass_style == "walking_glide":
-            walk = [
+            return [root, root + 12, chord_pool[min(2, len(chord_pool) - 1)] - 12, root + 14]
+        if self.plan.bass_style == "walking_glide":
+            return [
                 root,
                 chord_pool[min(1, len(chord_pool) - 1)] - 12,
                 chord_pool[min(2, len(chord_pool) - 1)] - 12,
                 next_root - 1 if next_root >= root else next_root + 1,
             ]
-            pitch = walk[note_index % len(walk)]
-        elif self.plan.bass_style == "counter_melody":
-            target = root + [0, 7, 10, 14, 12, 7][note_index % 6]
-            pitch = nearest_scale_note(target, self.lower_scale_pool)
-        else:
-            bounce = [root, root + 12, root + 7, root + 12]
-            pitch = bounce[note_index % len(bounce)]
+        if self.plan.bass_style == "counter_melody":
+            return [nearest_scale_note(root + interval, self.lower_scale_pool) for interval in (0, 7, 10, 14, 12, 7)]
+        return [root, root + 12, root + 7, root + 12]
 
+    def _choose_bass_pitch(self, cycle: list[int], note_index: int, section: SectionPlan) -> int:
+        pitch = cycle[note_index % len(cycle)]
         if self.plan.bass_sound == "upright_bass":
             pitch -= 2 if section.intensity < 0.6 and note_index % 2 == 0 else 0
         elif self.plan.bass_sound == "sine_sub":
@@ -304,67 +342,80 @@ class FusionComposer:
 
         motif = self._mutate_motif(self.base_motif, section, bar_index)
         rhythm = self._mutate_riff_steps(self.base_riff_steps, section, bar_index, role="lead")
-        anchor = nearest_scale_note(chord_root(chord_symbol, self.plan.key, self.plan.mode, octave=5) + 12, self.upper_scale_pool)
-        anchor_index = self.upper_scale_pool.index(anchor)
+        anchor_index = self._anchor_index(chord_symbol, "lead")
         velocity = int(54 + section.intensity * 34)
-
-        for note_index, step in enumerate(rhythm[: len(motif)]):
-            if self.rng.random() > min(0.98, section.lead_density + self.plan.riff_density * 0.28):
+        count = min(len(rhythm), len(motif))
+        gates = self.humanize_rng.random(count).tolist()
+        jitters = self.humanize_rng.uniform(-1.0, 1.0, size=count).tolist()
+        velocities = (velocity + self.humanize_rng.integers(-12, 13, size=count)).tolist()
+        notes = self.notes["lead"]
+        threshold = min(0.98, section.lead_density + self.plan.riff_density * 0.28)
+        last_index = len(self.lead_pitches) - 1
+        bar_end = bar_start + self.bar_duration
+
+        for step, next_step, degree, gate, jitter, note_velocity in zip(rhythm, rhythm[1:] + [16], motif, gates, jitters, velocities):
+            if gate > threshold:
                 continue
 
-            degree_offset = motif[note_index]
-            scale_index = max(0, min(len(self.upper_scale_pool) - 1, anchor_index + degree_offset))
-            pitch = self.upper_scale_pool[scale_index]
-            if self.plan.lead_sound == "muted_trumpet":
-                pitch = max(68, min(90, pitch))
-            elif self.plan.lead_sound == "flute":
-                pitch = max(72, min(96, pitch + 2))
-            elif self.plan.lead_sound == "analog_lead":
-                pitch = max(65, min(94, pitch))
-
-            start = self._step_time(bar_start, step, swingable=True)
-            next_step = rhythm[note_index + 1] if note_index + 1 < len(rhythm) else 16
-            duration = max(2, next_step - step)
-            end = min(bar_start + self.bar_duration, start + duration * self.sixteenth_duration * 0.88)
-            self._add_note(
-                self.instruments["lead"],
-                pitch,
-                start,
-                end,
-                velocity + self.rng.randint(-12, 12),
-            )
+            pitch = self.lead_pitches[max(0, min(last_index, anchor_index + degree))]
+            start = self._step_time(bar_start, step, swingable=True, jitter=jitter)
+            end = min(bar_end, start + max(2, next_step - step) * self.sixteenth_duration * 0.88)
+            notes.append(pitch, start, end, note_velocity)
+
+    def _lead_pitch(self, pitch: int) -> int:
+        if self.plan.lead_sound == "muted_trumpet":
+            return max(68, min(90, pitch))
+        if self.plan.lead_sound == "flute":
+            return max(72, min(96, pitch + 2))
+        if self.plan.lead_sound == "analog_lead":
+            return max(65, min(94, pitch))
+        return pitch
+
+    def _counter_pitch(self, pitch: int) -> int:
+        if self.plan.counter_sound == "guitar_harmonics":
+            return max(60, min(88, pitch + 12))
+        if self.plan.counter_sound == "clarinet":
+            return max(58, min(84, pitch))
+        return pitch
+
+    def _anchor_index(self, chord_symbol: str, role: str) -> int:
+        cache_key = (chord_symbol, role)
+        index = self.anchor_cache.get(cache_key)
+        if index is None:
+            if role == "lead":
+                pool = self.upper_scale_pool
+                target = chord_root(chord_symbol, self.plan.key, self.plan.mode, octave=5) + 12
+            else:
+                pool = self.mid_scale_pool
+                target = chord_root(chord_symbol, self.plan.key, self.plan.mode, octave=4) + 7
+            index = nearest_scale_index(target, pool)
+            self.anchor_cache[cache_key] = index
+        return index
 
     def _write_counter(self, section: SectionPlan, chord_symbol: str, bar_start: float, bar_index: int) -> None:
         if self.rng.random() > min(0.78, 0.26 + self.plan.variety_amount * 0.4):
             return
 
-        motif = self._mutate_motif([-degree for degree in self.base_motif[:5]], section, bar_index, counter=True)
+        motif = self._mutate_motif(self.counter_motif, section, bar_index, counter=True)
         rhythm = self._mutate_riff_steps(self.base_counter_steps, section, bar_index, role="counter")
-        anchor = nearest_scale_note(chord_root(chord_symbol, self.plan.key, self.plan.mode, octave=4) + 7, self.mid_scale_pool)
-        anchor_index = self.mid_scale_pool.index(anchor)
+        anchor_index = self._anchor_index(chord_symbol, "counter")
         velocity = int(36 + section.intensity * 24)
-
-        for note_index, step in enumerate(rhythm[: len(motif)]):
-            if self.rng.random() > 0.62:
+        count = min(len(rhythm), len(motif))
+        gates = self.humanize_rng.random(count).tolist()
+        jitters = self.humanize_rng.uniform(-1.0, 1.0, size=count).tolist()
+        velocities = (velocity + self.humanize_rng.integers(-8, 9, size=count)).tolist()
+        notes = self.notes["counter"]
+        last_index = len(self.counter_pitches) - 1
+        bar_end = bar_start + self.bar_duration
+
+        for step, next_step, degree, gate, jitter, note_velocity in zip(rhythm, rhythm[1:] + [16], motif, gates, jitters, velocities):
+            if gate > 0.62:
                 continue
 
-            scale_index = max(0, min(len(self.mid_scale_pool) - 1, anchor_index + motif[note_index]))
-            pitch = self.mid_scale_pool[scale_index]
-            if self.plan.counter_sound == "guitar_harmonics":
-                pitch = max(60, min(88, pitch + 12))
-            elif self.plan.counter_sound == "clarinet":
-                pitch = max(58, min(84, pitch))
-
-            start = self._step_time(bar_start, step, swingable=True)
-            next_step = rhythm[note_index + 1] if note_index + 1 < len(rhythm) else 16
-            end = min(bar_start + self.bar_duration, start + max(2, next_step - step) * self.sixteenth_duration * 0.74)
-            self._add_note(
-                self.instruments["counter"],
-                pitch,
-                start,
-                end,
-                velocity + self.rng.randint(-8, 8),
-            )
+            pitch = self.counter_pitches[max(0, min(last_index, anchor_index + degree))]
+            start = self._step_time(bar_start, step, swingable=True, jitter=jitter)
+            end = min(bar_end, start + max(2, next_step - step) * self.sixteenth_duration * 0.74)
+            notes.append(pitch, start, end, note_velocity)
 
     def _write_pad(
         self,
@@ -381,36 +432,51 @@ class FusionComposer:
         end = min(section_end, bar_start + self.bar_duration * hold_bars)
         pad_notes = sorted({pitch - 12 for pitch in voicing[:3]} | {voicing[-1] - 12})
         velocity = int(30 + section.intensity * 18)
+        self.notes["pad"].append_batch(
+            [max(43, min(86, pitch)) for pitch in pad_notes],
+            [bar_start] * len(pad_notes),
+            [end] * len(pad_notes),
+            [velocity + self.rng.randint(-5, 6) for _ in pad_notes],
+        )
 
-        for pitch in pad_notes:
-            self._add_note(
-                self.instruments["pad"],
-                max(43, min(86, pitch)),
-                bar_start,
-                end,
-                velocity + self.rng.randint(-5, 6),
-            )
-
-    def _write_drums(self, section: SectionPlan, bar_start: float, bar_index: int) -> None:
-        pattern_bank = DRUM_PATTERNS[self.plan.drum_style]
-        base_pattern = pattern_bank[(bar_index + self.rng.randrange(len(pattern_bank))) % len(pattern_bank)]
-        pattern = self._mutate_drum_pattern(base_pattern, section, bar_index)
+    def _write_drums(
+        self,
+        section: SectionPlan,
+        base_pattern: np.ndarray,
+        variation: int,
+        bar_start: float,
+        bar_index: int,
+    ) -> None:
+        pattern = self._mutate_drum_pattern(base_pattern, variation, section, bar_index)
 
         if bar_index == 0 and section.name == "chorus":
             self._add_drum_note("drums", 49, bar_start, 0.35, 92)
 
-        for step in range(16):
-            if pattern["kick"][step] and self.rng.random() < min(1.0, 0.8 + section.intensity * 0.24):
-                self._add_drum_note("drums", 36, self._step_time(bar_start, step, swingable=False), 0.18, int(84 + section.intensity * 30))
-            if pattern["snare"][step]:
-                pitch = 39 if self.plan.percussion_style == "rimshot" and self.rng.random() < 0.25 else 38
-                self._add_drum_note("drums", pitch, self._step_time(bar_start, step, swingable=False), 0.16, int(70 + section.intensity * 22))
-            if pattern["hat"][step] and (section.intensity > 0.3 or step % 4 == 0):
-                self._add_drum_note("drums", 42, self._step_time(bar_start, step, swingable=True), 0.08, int(36 + section.intensity * 20))
-            if pattern["ghost"][step] and section.intensity > 0.4 and self.rng.random() < min(0.9, section.intensity + self.plan.variety_amount * 0.2):
-                self._add_drum_note("drums", 37, self._step_time(bar_start, step, swingable=True), 0.05, int(24 + section.intensity * 12))
-            if pattern["open"][step] and section.intensity > 0.5:
-                self._add_drum_note("drums", 46, self._step_time(bar_start, step, swingable=True), 0.15, int(40 + section.intensity * 18))
+        intensity = section.intensity
+        hits = pattern.T.astype(bool)
+        rolls = self.humanize_rng.random(hits.shape)
+        hits[:, KICK] &= rolls[:, KICK] < min(1.0, 0.8 + intensity * 0.24)
+        hits[:, HAT] &= (intensity > 0.3) | DOWNBEAT_STEPS
+        hits[:, GHOST] &= (intensity > 0.4) & (rolls[:, GHOST] < min(0.9, intensity + self.plan.variety_amount * 0.2))
+        hits[:, OPEN] &= intensity > 0.5
+
+        steps, lanes = np.nonzero(hits)
+        pitches = DRUM_LANE_PITCHES[lanes]
+        if self.plan.percussion_style == "rimshot":
+            pitches = np.where((lanes == SNARE) & (rolls[steps, SNARE] < 0.25), 39, pitches)
+        lane_velocities = np.array(
+            [int(84 + intensity * 30), int(70 + intensity * 22), int(36 + intensity * 20), int(24 + intensity * 12), int(40 + intensity * 18)]
+        )
+        swing = np.where(DRUM_LANE_SWINGABLE[lanes], self.swing_grid[steps], 0.0)
+        jitter = self.humanize_rng.uniform(-1.0, 1.0, size=len(steps)) * self.jitter_scale
+        starts = np.maximum(bar_start, bar_start + self.step_grid[steps] + swing + jitter)
+
+        self.notes["drums"].append_batch(
+            pitches.tolist(),
+            starts.tolist(),
+            (starts + DRUM_LANE_DURATIONS[lanes]).tolist(),
+            lane_velocities[lanes].tolist(),
+        )
 
     def _write_percussion(self, section: SectionPlan, bar_start: float, bar_index: int) -> None:
         style = self.plan.percussion_style
@@ -436,10 +502,14 @@ class FusionComposer:
 
         steps = self._mutate_riff_steps(steps, section, bar_index, role="percussion")
         velocity = int(24 + section.intensity * 26)
-        for step in steps:
-            if self.rng.random() > min(0.95, 0.55 + self.plan.variety_amount * 0.3):
-                continue
-            self._add_drum_note("percussion", pitch, self._step_time(bar_start, step, swingable=True), duration, velocity + self.rng.randint(-6, 6))
+        gates = self.humanize_rng.random(len(steps)).tolist()
+        jitters = self.humanize_rng.uniform(-1.0, 1.0, size=len(steps)).tolist()
+        velocities = (velocity + self.humanize_rng.integers(-6, 7, size=len(steps))).tolist()
+        threshold = min(0.95, 0.55 + self.plan.variety_amount * 0.3)
+        for step, gate, jitter, note_velocity in zip(steps, gates, jitters, velocities):
+            if gate <= threshold:
+                start = self._step_time(bar_start, step, swingable=True, jitter=jitter)
+                self.notes["percussion"].append(pitch, start, start + duration, note_velocity)
 
     def _write_fill(self, start_time: float) -> None:
         fill = [
@@ -452,7 +522,7 @@ class FusionComposer:
         for offset, pitch, velocity in fill:
             self._add_drum_note("drums", pitch, start_time + offset, 0.12, velocity)
 
-    def _mutate_step_pattern(self, pattern: list[int], section: SectionPlan, bar_index: int, role: str) -> list[int]:
+    def _mutate_step_pattern(self, pattern: Sequence[int], section: SectionPlan, bar_index: int, role: str) -> list[int]:
         steps = sorted({max(0, min(15, int(step))) for step in pattern})
         amount = self.plan.variety_amount
 
@@ -477,31 +547,33 @@ class FusionComposer:
 
         return sorted({step % 16 for step in steps})
 
-    def _mutate_drum_pattern(self, pattern: dict[str, list[int]], section: SectionPlan, bar_index: int) -> dict[str, list[int]]:
-        mutated = {name: list(values) for name, values in pattern.items()}
+    def _build_drum_variations(self) -> tuple[np.ndarray, np.ndarray]:
+        amount = self.plan.variety_amount
+        rolls = self.humanize_rng.random((DRUM_VARIATION_COUNT, len(DRUM_LANES), 16))
+        flips = np.zeros(rolls.shape, dtype=np.uint8)
+        fills = np.zeros(rolls.shape, dtype=np.uint8)
+        flips[:, HAT] = rolls[:, HAT] < amount * 0.12
+        fills[:, [KICK, GHOST]] = (rolls[:, [KICK, GHOST]] < amount * 0.08) & DRUM_FILL_STEPS
+        return flips, fills
+
+    def _mutate_drum_pattern(self, pattern: np.ndarray, variation: int, section: SectionPlan, bar_index: int) -> np.ndarray:
+        mutated = (pattern ^ self.drum_flips[variation]) | self.drum_fills[variation]
         amount = self.plan.variety_amount
-
-        for lane_name, lane in mutated.items():
-            for step in range(len(lane)):
-                if lane_name == "hat" and self.rng.random() < amount * 0.12:
-                    lane[step] = 1 - lane[step]
-                elif lane_name in {"kick", "ghost"} and self.rng.random() < amount * 0.08:
-                    lane[step] = 1 if lane[step] == 0 and step not in {4, 12} else lane[step]
 
         if section.variation == "breakdown":
-            mutated["kick"] = [value if index in {0, 8} else 0 for index, value in enumerate(mutated["kick"])]
-            mutated["hat"] = [value if index % 4 == 0 else 0 for index, value in enumerate(mutated["hat"])]
+            mutated[KICK] *= KICK_BREAKDOWN_STEPS
+            mutated[HAT] *= DOWNBEAT_STEPS
         elif section.variation in {"lift", "release"}:
-            mutated["hat"][self.rng.choice([11, 13, 15])] = 1
-            mutated["ghost"][self.rng.choice([5, 7, 9, 11, 13])] = 1
+            mutated[HAT, self.rng.choice([11, 13, 15])] = 1
+            mutated[GHOST, self.rng.choice([5, 7, 9, 11, 13])] = 1
 
         if bar_index % 4 == 3 and self.rng.random() < amount * 0.55:
-            mutated["kick"][15] = 1
+            mutated[KICK, 15] = 1
 
         return mutated
 
     def _mutate_motif(self, motif: list[int], section: SectionPlan, bar_index: int, counter: bool = False) -> list[int]:
-        values = list(motif)
+        values = motif
         variation = self.plan.motif_variation
 
         if variation == "sequence":
@@ -541,80 +613,55 @@ class FusionComposer:
         return values[:8]
 
     def _mutate_riff_steps(self, steps: list[int], section: SectionPlan, bar_index: int, role: str) -> list[int]:
-        mutated = list(sorted({step % 16 for step in steps}))
+        mask = _steps_mask(steps)
         amount = self.plan.variety_amount
 
         if self.plan.motif_variation == "rhythm_flip":
-            mutated = sorted({(15 - step) for step in mutated})
+            mask = int(f"{mask:016b}"[::-1], 2)
         elif self.plan.motif_variation == "call_response" and bar_index % 2 == 1:
-            mutated = sorted({(step + 2) % 16 for step in mutated})
+            mask = ((mask << 2) | (mask >> 14)) & STEP_MASK
 
         if section.variation == "breakdown":
-            mutated = mutated[::2] or mutated[:1]
+            hits = _mask_steps(mask)
+            mask = _steps_mask(hits[::2] or hits[:1])
         elif section.variation in {"lift", "release"} and self.rng.random() < amount * 0.85:
-            mutated.append(self.rng.choice([13, 14, 15]))
+            mask |= 1 << self.rng.choice([13, 14, 15])
 
         if role == "counter":
-            mutated = [step for step in mutated if step % 2 == 1] or mutated
+            mask = mask & ODD_STEP_MASK or mask
         if role == "percussion" and self.rng.random() < amount * 0.5:
-            mutated.append(self.rng.choice([5, 11, 15]))
+            mask |= 1 << self.rng.choice([5, 11, 15])
 
-        return sorted({step % 16 for step in mutated})[:8]
+        return _mask_steps(mask)[:8]
 
     def _embellish_chord_symbol(self, chord_symbol: str, section: SectionPlan, section_index: int, bar_index: int) -> str:
         if self.rng.random() > self.plan.substitution_rate * max(0.25, section.intensity):
             return chord_symbol
 
-        replacements = (
-            ("maj7", "maj9"),
-            ("maj9", "maj13"),
-            ("7", "9"),
-            ("9", "11"),
-            ("11", "13"),
-            ("m7", "m9"),
-            ("m9", "m11"),
-            ("m11", "m13"),
-        )
-        for left, right in replacements:
-            if chord_symbol.endswith(left):
-                return chord_symbol[: -len(left)] + right
+        extended = extend_chord_symbol(chord_symbol)
+        if extended != chord_symbol:
+            return extended
 
         if bar_index == 0 and section_index % 2 == 1 and chord_symbol.endswith("13"):
             return chord_symbol[:-2] + "9"
         return chord_symbol
 
-    def _step_time(self, bar_start: float, step: int, swingable: bool) -> float:
-        time = bar_start + step * self.sixteenth_duration
-        if swingable and step % 4 >= 2:
-            time += self.plan.swing * self.sixteenth_duration
-        jitter = self.rng.uniform(-1.0, 1.0) * self.plan.humanization * self.sixteenth_duration
-        return max(bar_start, time + jitter)
-
-    def _add_note(
-        self,
-        instrument: pretty_midi.Instrument,
-        pitch: int,
-        start: float,
-        end: float,
-        velocity: int,
-    ) -> None:
-        if end <= start:
-            end = start + 0.05
-        instrument.notes.append(
-            pretty_midi.Note(
-                velocity=max(1, min(127, int(velocity))),
-                pitch=max(0, min(127, int(pitch))),
-                start=max(0.0, start),
-                end=max(start + 0.01, end),
-            )
-        )
+    def _step_time(self, bar_start: float, step: int, swingable: bool, jitter: float) -> float:
+        time = bar_start + self.step_offsets[step]
+        if swingable:
+            time += self.step_swing[step]
+        return max(bar_start, time + jitter * self.jitter_scale)
 
     def _add_drum_note(self, role: str, pitch: int, start: float, duration: float, velocity: int) -> None:
-        self.instruments[role].notes.append(
-            pretty_midi.Note(
-                velocity=max(1, min(127, int(velocity))),
-                pitch=pitch,
-                start=max(0.0, start),
-                end=max(start + 0.01, start + duration),
-            )
-        )
+        self.notes[role].append(pitch, start, start + duration, velocity)
+
+
+def _steps_mask(steps: Sequence[int]) -> int:
+    mask = 0
+    for step in steps:
+        mask |= 1 << (step % 16)
+    return mask
+
+
+def _mask_steps(mask: int) -> list[int]:
+    return [step for step in range(16) if mask >> step & 1]
@@ -295,6 +295,23 @@ MINOR_TRANSITIONS = {
     "VII": ("i", "III", "VI"),
 }
 
+DEGREE_ALTERNATES = {
+    "i": "I",
+    "I": "i",
+    "ii": "II",
+    "II": "ii",
+    "iii": "III",
+    "III": "iii",
+    "iv": "IV",
+    "IV": "iv",
+    "v": "V",
+    "V": "v",
+    "vi": "VI",
+    "VI": "vi",
+    "vii": "VII",
+    "VII": "vii",
+}
+
 PIANO_PATTERNS = {
     "dusty_chords": [
         [2, 10],
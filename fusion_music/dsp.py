@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+from scipy import signal
+
+
+def butter_sos(btype: str, cutoff: float | tuple[float, float], sample_rate: int) -> np.ndarray:
+    return np.array(_butter_sos(btype, cutoff, sample_rate))
+
+
+@lru_cache(maxsize=64)
+def _butter_sos(btype: str, cutoff: float | tuple[float, float], sample_rate: int) -> tuple[tuple[float, ...], ...]:
+    nyquist = sample_rate / 2
+    if isinstance(cutoff, tuple):
+        normalized = [value / nyquist for value in cutoff]
+    else:
+        normalized = cutoff / nyquist
+    return tuple(map(tuple, signal.butter(3, normalized, btype=btype, output="sos").tolist()))
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import random
+from typing import Sequence
 
-from .defaults import FAMILY_DEGREE_CHORDS, MAJOR_TRANSITIONS, MINOR_TRANSITIONS
+from .defaults import DEGREE_ALTERNATES, FAMILY_DEGREE_CHORDS, MAJOR_TRANSITIONS, MINOR_TRANSITIONS
 from .models import SectionPlan, TrackPlan
 
 
@@ -43,7 +44,7 @@ class HarmonyEngine:
         return progression, current_degree
 
     def _choose_next_degree(self, current_degree: str, section: SectionPlan) -> str:
-        options = list(self.transitions.get(current_degree, (self._tonic_degree(),)))
+        options: Sequence[str] = self.transitions.get(current_degree) or (self._tonic_degree(),)
         if section.variation == "breakdown":
             if self.rng.random() < 0.45:
                 return current_degree
@@ -95,11 +96,13 @@ class HarmonyEngine:
                 return degree
         return self._tonic_degree()
 
-    def _weighted_pool(self, options: list[str], favored: list[str]) -> list[str]:
+    def _weighted_pool(self, options: Sequence[str], favored: list[str]) -> Sequence[str]:
+        boosted = [degree for degree in favored if degree in options]
+        if not boosted:
+            return options
         weighted = list(options)
-        for degree in favored:
-            if degree in options:
-                weighted.extend([degree, degree])
+        for degree in boosted:
+            weighted.extend([degree, degree])
         return weighted
 
     def _tonic_degree(self) -> str:
@@ -124,23 +127,7 @@ class HarmonyEngine:
         if degree in self.degree_map:
             return degree
 
-        alternates = {
-            "i": "I",
-            "I": "i",
-            "ii": "II",
-            "II": "ii",
-            "iii": "III",
-            "III": "iii",
-            "iv": "IV",
-            "IV": "iv",
-            "v": "V",
-            "V": "v",
-            "vi": "VI",
-            "VI": "vi",
-            "vii": "VII",
-            "VII": "vii",
-        }
-        alternate = alternates.get(degree)
+        alternate = DEGREE_ALTERNATES.get(degree)
         if alternate in self.degree_map:
             return alternate
 
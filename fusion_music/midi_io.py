@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import mido
+import numpy as np
+import pretty_midi
+
+from .notes import note_array
+
+try:
+    import symusic
+except ImportError:
+    symusic = None
+
+
+def write_midi(midi: pretty_midi.PrettyMIDI, path: str | Path) -> None:
+    _, tempi = midi.get_tempo_changes()
+    # Both fast backends only write notes and program changes under a single tempo.
+    if len(tempi) != 1 or _has_extra_events(midi):
+        midi.write(str(path))
+        return
+
+    tempo = float(tempi[0])
+    if symusic is not None:
+        _write_with_symusic(midi, tempo, path)
+        return
+
+    seconds_per_tick = 60.0 / (tempo * midi.resolution)
+    output = mido.MidiFile(ticks_per_beat=midi.resolution)
+    output.tracks.append(
+        mido.MidiTrack(
+            [
+                mido.MetaMessage("set_tempo", time=0, tempo=int(6e7 / tempo)),
+                mido.MetaMessage("time_signature", time=0, numerator=4, denominator=4),
+                mido.MetaMessage("end_of_track", time=1),
+            ]
+        )
+    )
+
+    channels = [channel for channel in range(16) if channel != 9]
+    for index, instrument in enumerate(midi.instruments):
+        channel = 9 if instrument.is_drum else channels[index % len(channels)]
+        track = mido.MidiTrack()
+        if instrument.name:
+            track.append(mido.MetaMessage("track_name", time=0, name=instrument.name))
+        track.append(mido.Message("program_change", time=0, program=instrument.program, channel=channel))
+        track.extend(_note_messages(instrument, channel, seconds_per_tick))
+        output.tracks.append(track)
+
+    output.save(str(path))
+
+
+def _has_extra_events(midi: pretty_midi.PrettyMIDI) -> bool:
+    return bool(
+        midi.time_signature_changes
+        or midi.key_signature_changes
+        or midi.lyrics
+        or midi.text_events
+        or any(instrument.pitch_bends or instrument.control_changes for instrument in midi.instruments)
+    )
+
+
+def _note_messages(instrument: pretty_midi.Instrument, channel: int, seconds_per_tick: float) -> list[mido.Message | mido.MetaMessage]:
+    count = len(instrument.notes)
+    if count == 0:
+        return [mido.MetaMessage("end_of_track", time=1)]
+
+    notes = note_array(instrument)
+    ticks = np.rint(np.concatenate((notes["start"], notes["end"])) / seconds_per_tick).astype(np.int64)
+    event_pitches = np.concatenate((notes["pitch"], notes["pitch"]))
+    event_velocities = np.concatenate((notes["velocity"], np.zeros(count, dtype=np.int16)))
+    # Same-tick events follow pretty_midi's (pitch, velocity) order, so a note-off never lands after a re-strike.
+    order = np.lexsort((event_velocities, event_pitches, ticks))
+    ticks = ticks[order]
+    deltas = np.diff(ticks, prepend=0).tolist()
+
+    messages = [
+        mido.Message("note_on", time=delta, channel=channel, note=pitch, velocity=velocity)
+        for delta, pitch, velocity in zip(deltas, event_pitches[order].tolist(), event_velocities[order].tolist())
+    ]
+    messages.append(mido.MetaMessage("end_of_track", time=1))
+    return messages
+
+
+def _write_with_symusic(midi: pretty_midi.PrettyMIDI, tempo: float, path: str | Path) -> None:
+    seconds_per_tick = 60.0 / (tempo * midi.resolution)
+    score = symusic.Score(midi.resolution)
+    score.tempos.append(symusic.Tempo(0, mspq=int(6e7 / tempo)))
+    score.time_signatures.append(symusic.TimeSignature(0, 4, 4))
+
+    for instrument in midi.instruments:
+        notes = note_array(instrument)
+        start_ticks = np.rint(notes["start"] / seconds_per_tick).astype(np.int32)
+        end_ticks = np.rint(notes["end"] / seconds_per_tick).astype(np.int32)
+
+        track = symusic.Track(instrument.name, instrument.program, instrument.is_drum)
+        track.notes = symusic.Note.from_numpy(
+            start_ticks,
+            end_ticks - start_ticks,
+            notes["pitch"].astype(np.int8),
+            notes["velocity"].astype(np.int8),
+        )
+        score.tracks.append(track)
+
+    score.dump_midi(str(path))
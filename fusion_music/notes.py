@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+import pretty_midi
+
+NOTE_DTYPE = np.dtype([("start", np.float64), ("end", np.float64), ("pitch", np.int16), ("velocity", np.int16)])
+
+
+def note_array(instrument: pretty_midi.Instrument) -> np.ndarray:
+    notes = instrument.notes
+    array = np.empty(len(notes), dtype=NOTE_DTYPE)
+    array["start"] = np.fromiter((note.start for note in notes), dtype=np.float64, count=len(notes))
+    array["end"] = np.fromiter((note.end for note in notes), dtype=np.float64, count=len(notes))
+    array["pitch"] = np.fromiter((note.pitch for note in notes), dtype=np.int16, count=len(notes))
+    array["velocity"] = np.fromiter((note.velocity for note in notes), dtype=np.int16, count=len(notes))
+    return array
+
+
+@dataclass
+class NoteBuffer:
+    pitches: list[int] = field(default_factory=list)
+    starts: list[float] = field(default_factory=list)
+    ends: list[float] = field(default_factory=list)
+    velocities: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def append(self, pitch: int, start: float, end: float, velocity: int) -> None:
+        self.pitches.append(pitch)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.velocities.append(velocity)
+
+    def append_batch(
+        self,
+        pitches: Iterable[int],
+        starts: Iterable[float],
+        ends: Iterable[float],
+        velocities: Iterable[int],
+    ) -> None:
+        self.pitches.extend(pitches)
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        self.velocities.extend(velocities)
+
+    def to_array(self) -> np.ndarray:
+        starts = np.asarray(self.starts, dtype=np.float64)
+        ends = np.asarray(self.ends, dtype=np.float64)
+        ends = np.maximum(starts + 0.01, np.where(ends <= starts, starts + 0.05, ends))
+
+        notes = np.empty(len(self), dtype=NOTE_DTYPE)
+        notes["start"] = np.maximum(0.0, starts)
+        notes["end"] = ends
+        notes["pitch"] = np.clip(self.pitches, 0, 127)
+        notes["velocity"] = np.clip(self.velocities, 1, 127)
+        return notes[np.argsort(notes["start"], kind="stable")]
+
+    def to_notes(self) -> list[pretty_midi.Note]:
+        notes = self.to_array()
+        return list(
+            map(
+                pretty_midi.Note,
+                notes["velocity"].tolist(),
+                notes["pitch"].tolist(),
+                notes["start"].tolist(),
+                notes["end"].tolist(),
+            )
+        )
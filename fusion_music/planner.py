@@ -269,7 +269,7 @@ User vibe hint: {prompt_hint or "No extra hint. Choose a sophisticated late-nigh
 
             layers = raw_section.get("layers")
             if not isinstance(layers, list):
-                layers = list(default_section["layers"])
+                layers = default_section["layers"]
             layers = [layer for layer in layers if layer in LAYERS]
             if "keys" not in layers:
                 layers.insert(0, "keys")
@@ -7,7 +7,36 @@ import pretty_midi
 from scipy import signal
 
 from .ambience import AmbienceRenderer
+from .dsp import butter_sos
 from .models import TrackPlan
+from .notes import note_array
+
+KICK, RIM, SNARE, CLAP, HAT, CYMBAL, TOM, CONGA = range(8)
+DRUM_VOICES = {
+    35: (KICK, 0.0),
+    36: (KICK, 0.0),
+    37: (RIM, -0.14),
+    38: (SNARE, -0.03),
+    39: (CLAP, -0.03),
+    40: (SNARE, -0.03),
+    41: (TOM, -0.08),
+    42: (HAT, 0.24),
+    44: (HAT, 0.24),
+    46: (HAT, 0.24),
+    47: (TOM, 0.08),
+    49: (CYMBAL, 0.12),
+    50: (TOM, 0.08),
+    51: (CYMBAL, 0.12),
+    62: (CONGA, 0.07),
+    64: (CONGA, -0.05),
+    82: (HAT, 0.24),
+}
+DRUM_VOICE_BY_PITCH = np.full(128, HAT, dtype=np.int8)
+DRUM_VOICE_BY_PITCH[list(DRUM_VOICES)] = [voice for voice, _ in DRUM_VOICES.values()]
+DRUM_PAN_BY_PITCH = np.zeros(128)
+DRUM_PAN_BY_PITCH[list(DRUM_VOICES)] = [pan for _, pan in DRUM_VOICES.values()]
+TOM_HZ_BY_PITCH = np.full(128, 180.0)
+TOM_HZ_BY_PITCH[[41, 47, 50]] = (140.0, 180.0, 220.0)
 
 
 class AudioRenderer:
@@ -43,28 +72,25 @@ class AudioRenderer:
         if plan.ambience_layers:
             stems["ambience"] = self.ambience_renderer.render(duration, plan.ambience_layers)
 
-        sidechain = self._sidechain_envelope(total_samples, kick_hits)
-        for name, stem in list(stems.items()):
-            lower_name = name.lower()
-            if "drum" in lower_name or "percussion" in lower_name:
-                continue
-            if "bass:" in lower_name:
-                stems[name] = stem * sidechain[:, None] * 0.93
-            elif "ambience" in lower_name:
-                stems[name] = stem * sidechain[:, None] * 0.985
-            else:
-                stems[name] = stem * sidechain[:, None]
-
+        sidechain = self._sidechain_envelope(total_samples, kick_hits)[:, None]
         mix = np.zeros((total_samples, 2), dtype=np.float64)
-        for stem in stems.values():
+        for name, stem in stems.items():
+            lower_name = name.lower()
+            if "drum" not in lower_name and "percussion" not in lower_name:
+                stem *= sidechain
+                if "bass:" in lower_name:
+                    stem *= 0.93
+                elif "ambience" in lower_name:
+                    stem *= 0.985
             mix += stem
+            stems[name] = stem.astype(np.float32)
 
         mix = self._master_bus(mix, plan)
         peak = np.max(np.abs(mix))
         if peak > 0:
             mix = mix / peak * 0.90
 
-        return mix.astype(np.float32), {name: stem.astype(np.float32) for name, stem in stems.items()}
+        return mix.astype(np.float32), stems
 
     def _render_tonal_instrument(
         self,
@@ -74,15 +100,16 @@ class AudioRenderer:
         family: str,
     ) -> np.ndarray:
         mono = np.zeros(total_samples, dtype=np.float64)
-
-        for note in instrument.notes:
-            start = max(0, int(note.start * self.sample_rate))
-            end = min(total_samples, int(note.end * self.sample_rate))
-            if end <= start:
-                continue
-
+        notes = note_array(instrument)
+        starts, ends = self._note_sample_bounds(notes, total_samples)
+        velocities = self._note_velocities(notes)
+        pitches = notes["pitch"].tolist()
+
+        for index in np.flatnonzero(ends > starts).tolist():
+            start = int(starts[index])
+            end = int(ends[index])
             length = end - start
-            tone = self._synthesize_note(role, family, note.pitch, length, note.velocity / 127.0)
+            tone = self._synthesize_note(role, family, pitches[index], length, velocities[index])
             mono[start:end] += tone[:length]
 
         if role == "bass":
@@ -105,44 +132,49 @@ class AudioRenderer:
 
         return mono
 
+    def _note_sample_bounds(self, notes: np.ndarray, total_samples: int) -> tuple[np.ndarray, np.ndarray]:
+        starts = np.maximum(0, (notes["start"] * self.sample_rate).astype(np.int64))
+        ends = np.minimum(total_samples, (notes["end"] * self.sample_rate).astype(np.int64))
+        return starts, ends
+
+    def _note_velocities(self, notes: np.ndarray) -> list[float]:
+        return (notes["velocity"] / 127.0).tolist()
+
     def _render_drums(self, instrument: pretty_midi.Instrument, total_samples: int) -> tuple[np.ndarray, list[float]]:
         stereo = np.zeros((total_samples, 2), dtype=np.float64)
         kick_hits: list[float] = []
-
-        for note in instrument.notes:
-            start = max(0, int(note.start * self.sample_rate))
-            if start >= total_samples:
-                continue
-
-            velocity = note.velocity / 127.0
-            if note.pitch in {35, 36}:
+        notes = note_array(instrument)
+        starts, _ = self._note_sample_bounds(notes, total_samples)
+        velocities = self._note_velocities(notes)
+        voices = DRUM_VOICE_BY_PITCH[notes["pitch"]].tolist()
+        pans = DRUM_PAN_BY_PITCH[notes["pitch"]].tolist()
+        pitches = notes["pitch"].tolist()
+
+        for index in np.flatnonzero(starts < total_samples).tolist():
+            start = int(starts[index])
+            velocity = velocities[index]
+            pitch = pitches[index]
+            voice = voices[index]
+            if voice == KICK:
                 mono = self._kick(velocity)
-                pan = 0.0
-                kick_hits.append(note.start)
-            elif note.pitch in {37}:
+                kick_hits.append(float(notes["start"][index]))
+            elif voice == RIM:
                 mono = self._rim(velocity)
-                pan = -0.14
-            elif note.pitch in {38, 40, 39}:
-                mono = self._clap(velocity) if note.pitch == 39 else self._snare(velocity)
-                pan = -0.03
-            elif note.pitch in {42, 44, 46, 82}:
-                mono = self._hat(velocity, open_hat=note.pitch == 46, shaker=note.pitch == 82)
-                pan = 0.24
-            elif note.pitch in {49, 51}:
-                mono = self._cymbal(velocity, bright=note.pitch == 49)
-                pan = 0.12
-            elif note.pitch in {41, 47, 50}:
-                mono = self._tom(velocity, note.pitch)
-                pan = -0.08 if note.pitch == 41 else 0.08
-            elif note.pitch in {62, 64}:
-                mono = self._conga(velocity, low=note.pitch == 64)
-                pan = -0.05 if note.pitch == 64 else 0.07
+            elif voice == SNARE:
+                mono = self._snare(velocity)
+            elif voice == CLAP:
+                mono = self._clap(velocity)
+            elif voice == HAT:
+                mono = self._hat(velocity, open_hat=pitch == 46, shaker=pitch == 82)
+            elif voice == CYMBAL:
+                mono = self._cymbal(velocity, bright=pitch == 49)
+            elif voice == TOM:
+                mono = self._tom(velocity, pitch)
             else:
-                mono = self._hat(velocity, open_hat=False, shaker=False)
-                pan = 0.0
+                mono = self._conga(velocity, low=pitch == 64)
 
             end = min(total_samples, start + len(mono))
-            stereo[start:end] += self._pan(mono[: end - start], pan)
+            stereo[start:end] += self._pan(mono[: end - start], pans[index])
 
         stereo = np.tanh(stereo * 1.15)
         return stereo, kick_hits
@@ -380,8 +412,7 @@ class AudioRenderer:
     def _tom(self, velocity: float, pitch: int) -> np.ndarray:
         length = int(0.20 * self.sample_rate)
         t = np.arange(length) / self.sample_rate
-        freq_map = {41: 140, 47: 180, 50: 220}
-        freq = freq_map.get(pitch, 180)
+        freq = TOM_HZ_BY_PITCH[pitch]
         tone = np.sin(2 * np.pi * freq * t) * np.exp(-t * 12.0)
         return tone * velocity * 0.28
 
@@ -470,12 +501,7 @@ class AudioRenderer:
     def _apply_filter(self, mono: np.ndarray, btype: str, cutoff: float | tuple[float, float]) -> np.ndarray:
         if len(mono) < 64:
             return mono
-        if isinstance(cutoff, tuple):
-            normalized = [value / (self.sample_rate / 2) for value in cutoff]
-        else:
-            normalized = cutoff / (self.sample_rate / 2)
-        sos = signal.butter(3, normalized, btype=btype, output="sos")
-        return signal.sosfiltfilt(sos, mono)
+        return signal.sosfiltfilt(butter_sos(btype, cutoff, self.sample_rate), mono)
 
     def _stereo_filter(self, stereo: np.ndarray, btype: str, cutoff: float) -> np.ndarray:
         left = self._apply_filter(stereo[:, 0], btype, cutoff)
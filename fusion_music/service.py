@@ -11,7 +11,13 @@ from typing import Any
 
 import soundfile as sf
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .composer import FusionComposer
+from .midi_io import write_midi
 from .planner import LLMPlanner
 from .providers import create_provider
 from .render import AudioRenderer
@@ -84,7 +90,7 @@ def generate_track(request: GenerationRequest, project_root: Path | None = None)
     wav_path = output_dir / f"{basename}.wav"
     info_path = output_dir / f"{basename}_info.json"
 
-    midi.write(str(midi_path))
+    write_midi(midi, midi_path)
     sf.write(str(wav_path), mix, request.sample_rate)
 
     stem_paths: list[str] = []
@@ -110,7 +116,7 @@ def generate_track(request: GenerationRequest, project_root: Path | None = None)
             "wav": str(wav_path),
         },
     }
-    info_path.write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+    write_metadata(info_path, metadata)
 
     return GenerationResult(
         basename=basename,
@@ -123,6 +129,15 @@ def generate_track(request: GenerationRequest, project_root: Path | None = None)
     )
 
 
+def write_metadata(path: Path, metadata: dict[str, Any]) -> None:
+    if orjson is not None:
+        text = orjson.dumps(metadata, option=orjson.OPT_INDENT_2).decode("utf-8")
+    else:
+        text = json.dumps(metadata, indent=2, ensure_ascii=False)
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+
+
 def save_stems(stems: dict[str, object], output_dir: Path, basename: str, sample_rate: int) -> list[str]:
     stems_dir = output_dir / f"{basename}_stems"
     stems_dir.mkdir(parents=True, exist_ok=True)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Sequence
 
 from .defaults import KEY_TO_SEMITONE, MODE_INTERVALS
 
@@ -18,6 +20,19 @@ ROMAN_TO_DEGREE = {
 CHORD_PATTERN = re.compile(
     r"^(?P<accidental>[b#]?)(?P<roman>(?:VII|VI|IV|V|III|II|I|vii|vi|iv|v|iii|ii|i))(?P<quality>.*)$"
 )
+EXTENSION_PATTERN = re.compile(r"(maj7|maj9|7|9|11)$")
+EXTENSIONS = {"maj7": "maj9", "maj9": "maj13", "7": "9", "9": "11", "11": "13"}
+
+SCALE_DEGREES = {
+    (key, mode): tuple(semitone + interval for interval in intervals)
+    for key, semitone in KEY_TO_SEMITONE.items()
+    for mode, intervals in MODE_INTERVALS.items()
+}
+
+SCALE_PITCH_CLASSES = {
+    key_mode: frozenset(degree % 12 for degree in degrees)
+    for key_mode, degrees in SCALE_DEGREES.items()
+}
 
 
 def key_root_midi(key: str, octave: int = 4) -> int:
@@ -25,9 +40,8 @@ def key_root_midi(key: str, octave: int = 4) -> int:
     return 12 * (octave + 1) + semitone
 
 
-def scale_pitch_classes(key: str, mode: str) -> set[int]:
-    root_pc = KEY_TO_SEMITONE[key]
-    return {(root_pc + interval) % 12 for interval in MODE_INTERVALS[mode]}
+def scale_pitch_classes(key: str, mode: str) -> frozenset[int]:
+    return SCALE_PITCH_CLASSES[(key, mode)]
 
 
 def scale_notes_for_range(key: str, mode: str, low: int, high: int) -> list[int]:
@@ -43,12 +57,24 @@ def parse_chord_symbol(symbol: str) -> tuple[int, str, str, bool]:
     roman = match.group("roman")
     quality = match.group("quality").strip()
     degree = ROMAN_TO_DEGREE[roman.upper()]
-    return degree, quality, roman, roman.islower() or roman[0].islower()
+    return degree, quality, roman, roman.islower()
+
 
+@lru_cache(maxsize=None)
+def chord_shape(symbol: str) -> tuple[int, tuple[int, ...]]:
+    degree, quality, roman, is_minor_roman = parse_chord_symbol(symbol)
+    return degree, tuple(_intervals_for_quality(quality, is_minor_roman, roman))
 
+
+@lru_cache(maxsize=256)
+def extend_chord_symbol(symbol: str) -> str:
+    return EXTENSION_PATTERN.sub(lambda match: EXTENSIONS[match.group(1)], symbol, count=1)
+
+
+@lru_cache(maxsize=512)
 def chord_root(symbol: str, key: str, mode: str, octave: int = 3) -> int:
-    degree, _, _, _ = parse_chord_symbol(symbol)
-    root = key_root_midi(key, octave) + MODE_INTERVALS[mode][degree]
+    degree, _ = chord_shape(symbol)
+    root = 12 * (octave + 1) + SCALE_DEGREES[(key, mode)][degree]
     if symbol.startswith("b"):
         root -= 1
     elif symbol.startswith("#"):
@@ -63,13 +89,17 @@ def chord_tones(
     octave: int = 4,
     rootless: bool = False,
 ) -> list[int]:
+    return list(_chord_tones(symbol, key, mode, octave, rootless))
+
+
+@lru_cache(maxsize=512)
+def _chord_tones(symbol: str, key: str, mode: str, octave: int, rootless: bool) -> tuple[int, ...]:
     root = chord_root(symbol, key, mode, octave)
-    _, quality, roman, is_minor_roman = parse_chord_symbol(symbol)
-    intervals = _intervals_for_quality(quality, is_minor_roman, roman)
+    _, intervals = chord_shape(symbol)
     notes = [root + interval for interval in intervals]
     if rootless and len(notes) > 3:
         notes = notes[1:]
-    return sorted(notes)
+    return tuple(sorted(notes))
 
 
 def voice_led_chord(
@@ -82,6 +112,21 @@ def voice_led_chord(
     high: int = 84,
     center: int = 67,
 ) -> list[int]:
+    previous_key = tuple(previous) if previous is not None else None
+    return list(_voice_led_chord(symbol, key, mode, previous_key, rootless, low, high, center))
+
+
+@lru_cache(maxsize=1024)
+def _voice_led_chord(
+    symbol: str,
+    key: str,
+    mode: str,
+    previous: tuple[int, ...] | None,
+    rootless: bool,
+    low: int,
+    high: int,
+    center: int,
+) -> tuple[int, ...]:
     base = chord_tones(symbol, key, mode, octave=4, rootless=rootless)
     variants = []
     raw_variants = [base]
@@ -96,13 +141,23 @@ def voice_led_chord(
             variants.append(candidate)
 
     if previous is None:
-        return min(variants, key=lambda candidate: abs(_mean(candidate) - center))
+        return tuple(min(variants, key=lambda candidate: abs(_mean(candidate) - center)))
+
+    previous_notes = list(previous)
+    return tuple(min(variants, key=lambda candidate: _voice_leading_score(candidate, previous_notes, center)))
+
 
-    return min(variants, key=lambda candidate: _voice_leading_score(candidate, previous, center))
+def nearest_scale_note(target: int, scale_pool: Sequence[int]) -> int:
+    return scale_pool[nearest_scale_index(target, scale_pool)]
 
 
-def nearest_scale_note(target: int, scale_pool: Iterable[int]) -> int:
-    return min(scale_pool, key=lambda pitch: abs(pitch - target))
+def nearest_scale_index(target: int, scale_pool: Sequence[int]) -> int:
+    index = bisect_left(scale_pool, target)
+    if index == len(scale_pool):
+        return index - 1
+    if index > 0 and target - scale_pool[index - 1] <= scale_pool[index] - target:
+        return index - 1
+    return index
 
 
 def _intervals_for_quality(quality: str, is_minor_roman: bool, roman: str) -> list[int]:
@@ -155,19 +210,21 @@ def _intervals_for_quality(quality: str, is_minor_roman: bool, roman: str) -> li
 def _fit_to_register(notes: list[int], low: int, high: int, center: int) -> list[int]:
     adjusted = []
     for note in notes:
-        while note < low:
-            note += 12
-        while note > high:
-            note -= 12
+        if note < low:
+            note += 12 * -((note - low) // 12)
+        if note > high:
+            note -= 12 * -((high - note) // 12)
         adjusted.append(note)
 
-    mean = _mean(adjusted)
-    while mean < center - 5 and max(adjusted) + 12 <= high + 12:
-        adjusted = [note + 12 for note in adjusted]
-        mean = _mean(adjusted)
-    while mean > center + 5 and min(adjusted) - 12 >= low - 12:
-        adjusted = [note - 12 for note in adjusted]
-        mean = _mean(adjusted)
+    count = len(adjusted)
+    total = sum(adjusted)
+    if total < (center - 5) * count and max(adjusted) <= high:
+        octaves = min(-((total - (center - 5) * count) // (12 * count)), (high - max(adjusted)) // 12 + 1)
+        adjusted = [note + 12 * octaves for note in adjusted]
+        total += 12 * octaves * count
+    if total > (center + 5) * count and min(adjusted) >= low:
+        octaves = min(-(((center + 5) * count - total) // (12 * count)), (min(adjusted) - low) // 12 + 1)
+        adjusted = [note - 12 * octaves for note in adjusted]
 
     return sorted(adjusted)
 
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pretty_midi
+
+from fusion_music import midi_io
+from fusion_music.composer import FusionComposer
+from fusion_music.planner import LLMPlanner
+
+
+class WriteMidiTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_mido_fallback_matches_pretty_midi(self) -> None:
+        expected = self.directory / "expected.mid"
+        actual = self.directory / "actual.mid"
+        for seed in (1, 7, 19):
+            midi, _ = FusionComposer(LLMPlanner().build_plan(seed=seed, use_provider=False)).compose()
+            midi.write(str(expected))
+            with mock.patch.object(midi_io, "symusic", None):
+                midi_io.write_midi(midi, actual)
+
+            with self.subTest(seed=seed):
+                self.assertEqual(actual.read_bytes(), expected.read_bytes())
+
+    def test_controller_events_are_kept(self) -> None:
+        midi = pretty_midi.PrettyMIDI(initial_tempo=90)
+        instrument = pretty_midi.Instrument(program=0, name="keys")
+        instrument.notes.append(pretty_midi.Note(velocity=80, pitch=60, start=0.0, end=1.0))
+        instrument.pitch_bends.append(pretty_midi.PitchBend(pitch=1024, time=0.5))
+        instrument.control_changes.append(pretty_midi.ControlChange(number=64, value=127, time=0.25))
+        midi.instruments.append(instrument)
+
+        path = self.directory / "controllers.mid"
+        for backend in {None, midi_io.symusic}:
+            with self.subTest(symusic=backend is not None), mock.patch.object(midi_io, "symusic", backend):
+                midi_io.write_midi(midi, path)
+                written = pretty_midi.PrettyMIDI(str(path)).instruments[0]
+                self.assertEqual([bend.pitch for bend in written.pitch_bends], [1024])
+                self.assertEqual([(change.number, change.value) for change in written.control_changes], [(64, 127)])
+
+
+if __name__ == "__main__":
+    unittest.main()